@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Agregação de sentimentos classificados em janelas de tempo, por fonte,
+com memória fixa independente da duração do fluxo.
+"""
+
+import threading
+import time
+from array import array
+
+ROTULOS = ('positivo', 'negativo')
+
+# Fonte compartilhada que recebe os eventos de fontes além de max_fontes
+FONTE_EXCEDENTE = '__outras__'
+
+
+class _EstadoFonte:
+    """
+    Buffer circular com as contagens das últimas janelas de uma fonte.
+
+    Cada janela ocupa um bloco contíguo em 'dados': as contagens por
+    rótulo seguidas do histograma de confiança de cada rótulo.
+    """
+
+    def __init__(self, num_janelas, tamanho_bloco):
+        self.dados = array('L', bytes(num_janelas * tamanho_bloco * array('L').itemsize))
+        self.ids = array('q', [-1] * num_janelas)
+        self.soma_deslizante = array('L', bytes(tamanho_bloco * array('L').itemsize))
+        self.atual = None
+        self.descartados = 0
+
+
+class AgregadorJanelas:
+    """
+    Mantém, por fonte e no total, contagens de positivos/negativos e
+    histogramas de confiança em janelas fixas (tumbling) e numa janela
+    deslizante formada pelas últimas 'janelas_deslizantes' janelas.
+
+    Cada evento é registrado em O(1); a janela deslizante é mantida por
+    soma incremental, subtraindo as janelas que saem dela.
+    """
+
+    def __init__(self, largura_janela=60, num_janelas=60, janelas_deslizantes=5,
+                 num_faixas=10, max_fontes=100):
+        if largura_janela <= 0:
+            raise ValueError("Largura da janela deve ser positiva")
+        if not 1 <= janelas_deslizantes <= num_janelas:
+            raise ValueError("Janela deslizante deve ter entre 1 e num_janelas janelas")
+        if num_faixas < 1:
+            raise ValueError("Histograma deve ter pelo menos uma faixa")
+
+        self.largura_janela = largura_janela
+        self.num_janelas = num_janelas
+        self.janelas_deslizantes = janelas_deslizantes
+        self.num_faixas = num_faixas
+        self.max_fontes = max_fontes
+        self._tamanho_bloco = len(ROTULOS) * (1 + num_faixas)
+        self._estados = {None: self._novo_estado()}
+        self._num_fontes = 0
+        self._primeira_janela = None
+        self._lock = threading.Lock()
+
+    def _novo_estado(self):
+        return _EstadoFonte(self.num_janelas, self._tamanho_bloco)
+
+    def _estado(self, fonte):
+        estado = self._estados.get(fonte)
+        if estado is None:
+            if fonte != FONTE_EXCEDENTE:
+                if self._num_fontes >= self.max_fontes:
+                    # Limite atingido: agrupar na fonte compartilhada
+                    return self._estado(FONTE_EXCEDENTE)
+                self._num_fontes += 1
+            estado = self._estados[fonte] = self._novo_estado()
+        return estado
+
+    def registrar(self, sentimento, confianca, fonte='padrao', timestamp=None):
+        """
+        Registra um evento classificado, por exemplo a saída de
+        classificar_sentimento. Retorna False se o evento for mais antigo
+        que a janela mais velha mantida e tiver sido descartado.
+
+        Depois de 'max_fontes' fontes distintas, eventos de fontes novas
+        são contados no total e na fonte FONTE_EXCEDENTE.
+        """
+        if sentimento not in ROTULOS:
+            raise ValueError(f"Sentimento desconhecido: {sentimento}")
+        if not 0.0 <= confianca <= 1.0:
+            raise ValueError("Confiança deve estar entre 0 e 1")
+
+        if timestamp is None:
+            timestamp = time.time()
+
+        id_janela = int(timestamp // self.largura_janela)
+        indice_rotulo = ROTULOS.index(sentimento)
+        faixa = min(int(confianca * self.num_faixas), self.num_faixas - 1)
+        posicoes = (
+            indice_rotulo,
+            len(ROTULOS) + indice_rotulo * self.num_faixas + faixa,
+        )
+
+        with self._lock:
+            # O total define o relógio global; a fonte é alinhada a ele antes
+            # de registrar, para que janelas sem eventos dela fiquem vazias
+            registrado = self._registrar_em(self._estados[None], id_janela, posicoes)
+            if fonte is not None:
+                estado = self._estado(fonte)
+                self._sincronizar(estado)
+                registrado = self._registrar_em(estado, id_janela, posicoes) and registrado
+            return registrado
+
+    def _sincronizar(self, estado):
+        """
+        Avança o relógio de uma fonte até o relógio global.
+        """
+        atual_global = self._estados[None].atual
+        if atual_global is None:
+            return
+        if estado.atual is None:
+            estado.atual = atual_global
+        elif atual_global > estado.atual:
+            self._avancar_estado(estado, atual_global)
+
+    def _registrar_em(self, estado, id_janela, posicoes):
+        if estado.atual is None:
+            estado.atual = id_janela
+        elif id_janela > estado.atual:
+            self._avancar_estado(estado, id_janela)
+        elif id_janela <= estado.atual - self.num_janelas:
+            estado.descartados += 1
+            return False
+
+        if self._primeira_janela is None or id_janela < self._primeira_janela:
+            self._primeira_janela = id_janela
+
+        slot = id_janela % self.num_janelas
+        base = slot * self._tamanho_bloco
+        if estado.ids[slot] != id_janela:
+            # Slot ainda guarda uma janela antiga: reaproveitar
+            for i in range(base, base + self._tamanho_bloco):
+                estado.dados[i] = 0
+            estado.ids[slot] = id_janela
+
+        na_deslizante = id_janela > estado.atual - self.janelas_deslizantes
+        for posicao in posicoes:
+            estado.dados[base + posicao] += 1
+            if na_deslizante:
+                estado.soma_deslizante[posicao] += 1
+        return True
+
+    def _avancar_estado(self, estado, id_janela):
+        anterior = estado.atual
+        if id_janela - anterior >= self.janelas_deslizantes:
+            for i in range(self._tamanho_bloco):
+                estado.soma_deslizante[i] = 0
+        else:
+            # Subtrair apenas as janelas que deixam a janela deslizante
+            for id_saindo in range(anterior - self.janelas_deslizantes + 1,
+                                   id_janela - self.janelas_deslizantes + 1):
+                slot = id_saindo % self.num_janelas
+                if estado.ids[slot] != id_saindo:
+                    continue
+                base = slot * self._tamanho_bloco
+                for i in range(self._tamanho_bloco):
+                    estado.soma_deslizante[i] -= estado.dados[base + i]
+        estado.atual = id_janela
+
+    def avancar(self, timestamp=None):
+        """
+        Avança o relógio de todas as fontes sem registrar eventos, para que
+        períodos sem dados apareçam como janelas vazias.
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        id_janela = int(timestamp // self.largura_janela)
+
+        with self._lock:
+            total = self._estados[None]
+            if total.atual is None:
+                total.atual = id_janela
+            elif id_janela > total.atual:
+                self._avancar_estado(total, id_janela)
+
+            for fonte, estado in self._estados.items():
+                if fonte is not None:
+                    self._sincronizar(estado)
+
+    def _resumo(self, bloco, id_inicio, id_fim):
+        contagens = {rotulo: bloco[i] for i, rotulo in enumerate(ROTULOS)}
+        total = sum(contagens.values())
+
+        resumo = {
+            'inicio': id_inicio * self.largura_janela,
+            'fim': (id_fim + 1) * self.largura_janela,
+            'total': total,
+        }
+        for i, rotulo in enumerate(ROTULOS):
+            resumo[rotulo] = contagens[rotulo]
+            resumo[f'taxa_{rotulo}'] = contagens[rotulo] / total if total else 0.0
+
+        inicio_hist = len(ROTULOS)
+        resumo['histograma_confianca'] = {
+            rotulo: list(bloco[inicio_hist + i * self.num_faixas:
+                               inicio_hist + (i + 1) * self.num_faixas])
+            for i, rotulo in enumerate(ROTULOS)
+        }
+        return resumo
+
+    def janela(self, fonte=None, atras=0):
+        """
+        Retorna o resumo de uma janela fixa: atras=0 é a janela atual,
+        atras=1 a anterior e assim por diante. fonte=None consulta o total.
+        """
+        if not 0 <= atras < self.num_janelas:
+            raise ValueError(f"Só as últimas {self.num_janelas} janelas são mantidas")
+
+        with self._lock:
+            estado = self._estados.get(fonte)
+            if estado is None or estado.atual is None:
+                return None
+            self._sincronizar(estado)
+
+            id_janela = estado.atual - atras
+            if self._primeira_janela is not None and id_janela < self._primeira_janela:
+                return None
+            slot = id_janela % self.num_janelas
+            if estado.ids[slot] == id_janela:
+                base = slot * self._tamanho_bloco
+                bloco = estado.dados[base:base + self._tamanho_bloco]
+            else:
+                bloco = array('L', bytes(self._tamanho_bloco * array('L').itemsize))
+            return self._resumo(bloco, id_janela, id_janela)
+
+    def janela_atual(self, fonte=None):
+        """
+        Retorna o resumo da janela fixa mais recente.
+        """
+        return self.janela(fonte, 0)
+
+    def historico(self, fonte=None, quantidade=None):
+        """
+        Retorna os resumos das últimas janelas fixas, da mais recente para a mais antiga.
+        """
+        if quantidade is None:
+            quantidade = self.num_janelas
+        quantidade = min(quantidade, self.num_janelas)
+
+        resumos = []
+        for atras in range(quantidade):
+            resumo = self.janela(fonte, atras)
+            if resumo is None:
+                break
+            resumos.append(resumo)
+        return resumos
+
+    def janela_deslizante(self, fonte=None):
+        """
+        Retorna o resumo das últimas 'janelas_deslizantes' janelas somadas.
+        """
+        with self._lock:
+            estado = self._estados.get(fonte)
+            if estado is None or estado.atual is None:
+                return None
+            self._sincronizar(estado)
+
+            return self._resumo(
+                estado.soma_deslizante,
+                estado.atual - self.janelas_deslizantes + 1,
+                estado.atual,
+            )
+
+    def fontes(self):
+        """
+        Lista as fontes que já enviaram eventos.
+        """
+        with self._lock:
+            return [fonte for fonte in self._estados if fonte is not None]
+
+    def descartados(self, fonte=None):
+        """
+        Número de eventos descartados por chegarem atrasados demais.
+        """
+        with self._lock:
+            estado = self._estados.get(fonte)
+            return estado.descartados if estado else 0
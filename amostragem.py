@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Amostragem por reservatório estratificada para limitar o tamanho
+do conjunto de treinamento mantendo as classes balanceadas.
+"""
+
+import heapq
+import math
+import random
+from collections import Counter
+
+
+class ReservatorioEstratificado:
+    """
+    Mantém no máximo 'orcamento' exemplos, divididos igualmente entre
+    os rótulos, atualizado online a cada exemplo recebido.
+
+    Cada rótulo tem seu próprio reservatório com chaves aleatórias
+    (truque de Gumbel): com peso_recencia = 0 a amostra é uniforme sobre
+    tudo que já foi visto; com peso_recencia > 0 o peso de um exemplo
+    cresce por um fator e^peso_recencia a cada novo exemplo recebido,
+    favorecendo os mais recentes.
+    """
+
+    def __init__(self, orcamento, rotulos=('positivo', 'negativo'), peso_recencia=0.0, semente=None):
+        if orcamento < len(rotulos):
+            raise ValueError(f"Orçamento deve ser de pelo menos {len(rotulos)} exemplos")
+        if peso_recencia < 0:
+            raise ValueError("Peso de recência não pode ser negativo")
+
+        self.orcamento = orcamento
+        self.peso_recencia = peso_recencia
+        self.capacidades = {
+            rotulo: orcamento // len(rotulos) + (1 if i < orcamento % len(rotulos) else 0)
+            for i, rotulo in enumerate(rotulos)
+        }
+        self._random = random.Random(semente)
+        self.limpar()
+
+    def limpar(self):
+        """
+        Descarta todos os exemplos e reinicia as contagens.
+        """
+        # Lista compacta com os exemplos mantidos; as posições liberadas
+        # por exemplos descartados são reaproveitadas pelos novos, então a
+        # ordem de chegada fica em 'chegadas', alinhada com 'exemplos'.
+        self.exemplos = []
+        self.chegadas = []
+        self._heaps = {rotulo: [] for rotulo in self.capacidades}
+        self.vistos = Counter()
+        self._contador = 0
+
+    def adicionar(self, exemplo, rotulo, chegada=None):
+        """
+        Oferece um exemplo ao reservatório do seu rótulo.
+        'chegada' permite repassar um exemplo com a posição em que chegou
+        originalmente, preservando o peso de recência.
+        Retorna True se o exemplo foi mantido na amostra.
+        """
+        if rotulo not in self.capacidades:
+            raise ValueError(f"Rótulo desconhecido: {rotulo}")
+
+        if chegada is None:
+            chegada = self._contador + 1
+        self._contador = max(self._contador, chegada)
+        self.vistos[rotulo] += 1
+
+        # -log(Exp(1)) é uma variável de Gumbel; somar o termo de recência
+        # equivale a sortear com peso e^(peso_recencia * chegada).
+        exponencial = self._random.expovariate(1.0) or 1e-300
+        chave = self.peso_recencia * chegada - math.log(exponencial)
+
+        heap = self._heaps[rotulo]
+        if len(heap) < self.capacidades[rotulo]:
+            heapq.heappush(heap, (chave, len(self.exemplos)))
+            self.exemplos.append(exemplo)
+            self.chegadas.append(chegada)
+            return True
+
+        menor_chave, posicao = heap[0]
+        if chave <= menor_chave:
+            return False
+
+        heapq.heapreplace(heap, (chave, posicao))
+        self.exemplos[posicao] = exemplo
+        self.chegadas[posicao] = chegada
+        return True
+
+    def herdar_contagens(self, vistos, ultima_chegada=0):
+        """
+        Preserva o histórico de um reservatório anterior ao reconstruir a
+        amostra: 'vistos' passa a contar também os exemplos já descartados
+        e novas chegadas continuam a partir de 'ultima_chegada'.
+        """
+        for rotulo, quantidade in vistos.items():
+            if rotulo in self.capacidades:
+                self.vistos[rotulo] = max(self.vistos[rotulo], quantidade)
+        self._contador = max(self._contador, ultima_chegada)
+
+    @property
+    def ultima_chegada(self):
+        """
+        Posição de chegada do exemplo mais recente oferecido.
+        """
+        return self._contador
+
+    def itens_por_chegada(self):
+        """
+        Retorna os pares (chegada, exemplo) mantidos, do mais antigo ao mais recente.
+        """
+        return sorted(zip(self.chegadas, self.exemplos), key=lambda item: item[0])
+
+    def contagens(self):
+        """
+        Retorna, por rótulo, quantos exemplos estão mantidos e quantos já foram vistos.
+        """
+        return {
+            rotulo: {'mantidos': len(heap), 'vistos': self.vistos[rotulo]}
+            for rotulo, heap in self._heaps.items()
+        }
+
+    def __len__(self):
+        return len(self.exemplos)
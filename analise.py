@@ -5,13 +5,20 @@ import threading
 import requests
 import json
 from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
+from nltk.tokenize import word_tokenize, sent_tokenize
 from nltk.stem import PorterStemmer
 from nltk.classify import NaiveBayesClassifier
-from collections import Counter
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 import string
 from datetime import datetime
 import os
+import hashlib
+from memoria import relatorio_memoria_modelo, rastrear_pico_memoria, formatar_bytes
+from amostragem import ReservatorioEstratificado
+from cache_caracteristicas import CacheCaracteristicas
+from pontuacao import PontuadorAntecipado
 
 # Download dos recursos necessários do NLTK
 try:
@@ -24,11 +31,21 @@ try:
 except LookupError:
     nltk.download('stopwords')
 
+# Incrementar sempre que preprocessar_texto mudar, para invalidar o cache
+VERSAO_PREPROCESSAMENTO = 1
+
 class ClassificadorSentimentos:
-    def __init__(self):
+    def __init__(self, caminho_cache=None):
         self.stemmer = PorterStemmer()
         self.stop_words = set(stopwords.words('english'))
         self.classificador = None
+        self.exemplos_treinados = 0
+        self._pontuador = None
+        
+        # Cache em disco dos textos já preprocessados (None = desativado)
+        self.cache = None
+        if caminho_cache:
+            self.ativar_cache(caminho_cache)
         
         # Conjunto de frases de treinamento (positivas e negativas)
         self.frases_treinamento = [
@@ -63,6 +80,14 @@ class ClassificadorSentimentos:
         
         # Lista para armazenar dados de treinamento adicionais
         self.dados_adicionais = []
+        
+        # Reservatório que limita os dados adicionais (None = sem limite)
+        self.reservatorio = None
+        
+        # Incrementada a cada mudança nos dados adicionais, para saber se o
+        # modelo em uso foi treinado com os dados atuais
+        self._versao_dados = 0
+        self._dados_do_modelo = None
     
     def preprocessar_texto(self, texto):
         """
@@ -87,6 +112,35 @@ class ClassificadorSentimentos:
         
         return tokens_processados
     
+    def versao_pipeline(self):
+        """
+        Identifica a configuração de preprocessamento (stop words, stemmer e
+        tokenizador), usada para invalidar o cache quando ela muda.
+        """
+        componentes = [
+            str(VERSAO_PREPROCESSAMENTO),
+            type(self.stemmer).__name__,
+            str(getattr(self.stemmer, 'mode', '')),
+            f"{word_tokenize.__module__}.{word_tokenize.__name__}:english",
+            *sorted(self.stop_words),
+        ]
+        return hashlib.sha256('\n'.join(componentes).encode('utf-8')).hexdigest()[:16]
+    
+    def ativar_cache(self, caminho='cache_caracteristicas.db'):
+        """
+        Ativa o cache em disco de textos preprocessados usado no treinamento.
+        """
+        self.cache = CacheCaracteristicas(caminho, self.versao_pipeline())
+        print(f"🗄️  Cache de preprocessamento: '{caminho}' ({len(self.cache)} textos)")
+    
+    def _preprocessar_com_cache(self, texto):
+        """
+        Preprocessa o texto reaproveitando o cache em disco, se ativo.
+        """
+        if self.cache is None:
+            return self.preprocessar_texto(texto)
+        return self.cache.obter_ou_calcular(texto, self.preprocessar_texto)
+    
     def extrair_caracteristicas(self, tokens):
         """
         Extrai características do texto para o classificador.
@@ -110,15 +164,97 @@ class ClassificadorSentimentos:
         """
         Adiciona novos dados de treinamento.
         """
-        if sentimento.lower() in ['positivo', 'pos', 'p', '1']:
-            sentimento_norm = 'positivo'
-        elif sentimento.lower() in ['negativo', 'neg', 'n', '0']:
-            sentimento_norm = 'negativo'
+        sentimento_norm = self._normalizar_sentimento(sentimento)
+        self._registrar_exemplo(frase, sentimento_norm)
+        return sentimento_norm
+    
+    def _registrar_exemplo(self, frase, sentimento):
+        """
+        Guarda um exemplo adicional, respeitando o orçamento de treinamento se houver.
+        """
+        if self.reservatorio is None:
+            self.dados_adicionais.append((frase, sentimento))
         else:
-            raise ValueError("Sentimento deve ser 'positivo' ou 'negativo'")
+            self.reservatorio.adicionar((frase, sentimento), sentimento)
+        self._versao_dados += 1
+    
+    def configurar_orcamento(self, orcamento, peso_recencia=0.0):
+        """
+        Limita os dados adicionais a 'orcamento' exemplos, balanceados por
+        sentimento via amostragem por reservatório estratificada.
+        Com orcamento None o limite é removido.
+        """
+        itens = self._itens_por_chegada()
+        anterior = self.reservatorio
         
-        self.dados_adicionais.append((frase, sentimento_norm))
-        return sentimento_norm
+        if orcamento is None:
+            self.reservatorio = None
+            self.dados_adicionais = [exemplo for _, exemplo in itens]
+            self._versao_dados += 1
+            print("♾️  Orçamento de treinamento removido")
+            return
+        
+        self.reservatorio = ReservatorioEstratificado(orcamento, peso_recencia=peso_recencia)
+        self._aplicar_orcamento(itens)
+        if anterior is not None:
+            self.reservatorio.herdar_contagens(anterior.vistos, anterior.ultima_chegada)
+        
+        print(f"📦 Orçamento de treinamento: {orcamento} exemplos (recência: {peso_recencia})")
+        print(f"📊 Dados adicionais mantidos: {len(self.dados_adicionais)}")
+    
+    def _itens_por_chegada(self):
+        """
+        Retorna os dados adicionais como pares (chegada, exemplo) em ordem de chegada.
+        Sem orçamento a própria lista já está nessa ordem.
+        """
+        if self.reservatorio is None:
+            return list(enumerate(self.dados_adicionais, 1))
+        return self.reservatorio.itens_por_chegada()
+    
+    def _contagens_vistas(self):
+        """
+        Retorna (vistos por sentimento, última chegada) dos dados adicionais,
+        incluindo os exemplos que o orçamento já descartou.
+        """
+        if self.reservatorio is None:
+            vistos = Counter(sentimento for _, sentimento in self.dados_adicionais)
+            return dict(vistos), len(self.dados_adicionais)
+        return dict(self.reservatorio.vistos), self.reservatorio.ultima_chegada
+    
+    def _aplicar_orcamento(self, itens):
+        """
+        Repassa pares (chegada, exemplo) pelo reservatório, mantendo a posição
+        de chegada original de cada exemplo para o peso de recência.
+        """
+        self.reservatorio.limpar()
+        self.dados_adicionais = self.reservatorio.exemplos
+        self._versao_dados += 1
+        
+        for chegada, (frase, sentimento) in itens:
+            self.reservatorio.adicionar((frase, sentimento), sentimento, chegada=chegada)
+    
+    def limpar_dados_adicionais(self):
+        """
+        Remove todos os dados adicionais, mantendo o orçamento configurado.
+        """
+        if self.reservatorio is None:
+            self.dados_adicionais.clear()
+        else:
+            self.reservatorio.limpar()
+            self.dados_adicionais = self.reservatorio.exemplos
+        self._versao_dados += 1
+    
+    def _normalizar_sentimento(self, sentimento):
+        """
+        Converte as formas abreviadas aceitas para 'positivo' ou 'negativo'.
+        """
+        sentimento = str(sentimento).lower()
+        if sentimento in ['positivo', 'pos', 'p', '1']:
+            return 'positivo'
+        elif sentimento in ['negativo', 'neg', 'n', '0']:
+            return 'negativo'
+        else:
+            raise ValueError("Sentimento deve ser 'positivo' ou 'negativo'")
     
     def treinar_classificador(self, usar_dados_adicionais=True):
         """
@@ -126,32 +262,209 @@ class ClassificadorSentimentos:
         """
         print("Iniciando treinamento do classificador...")
         
-        # Combinar dados originais com dados adicionais
-        todos_dados = self.frases_treinamento.copy()
+        # Encadear dados originais e adicionais sem copiar as listas
+        todos_dados = self.frases_treinamento
         if usar_dados_adicionais:
-            todos_dados.extend(self.dados_adicionais)
-        
-        # Preprocessar e extrair características de todas as frases
-        dados_treinamento = []
-        for frase, sentimento in todos_dados:
-            tokens = self.preprocessar_texto(frase)
-            caracteristicas = self.extrair_caracteristicas(tokens)
-            dados_treinamento.append((caracteristicas, sentimento))
-        
-        # Embaralhar os dados
-        random.shuffle(dados_treinamento)
+            todos_dados = chain(self.frases_treinamento, self.dados_adicionais)
         
-        # Treinar o classificador
-        self.classificador = NaiveBayesClassifier.train(dados_treinamento)
+        contagem = self._treinar_de_iteravel(todos_dados)
+        self._dados_do_modelo = (self._versao_dados, usar_dados_adicionais)
         
-        print(f"Treinamento concluído com {len(dados_treinamento)} exemplos!")
+        print(f"Treinamento concluído com {sum(contagem.values())} exemplos!")
         print(f"  - Dados originais: {len(self.frases_treinamento)}")
         print(f"  - Dados adicionais: {len(self.dados_adicionais)}")
+        if self.cache is not None:
+            print(f"  - Cache: {self.cache.acertos} reaproveitados, {self.cache.falhas} preprocessados")
         
         # Mostrar as características mais informativas
         print("\nCaracterísticas mais informativas:")
         self.classificador.show_most_informative_features(10)
     
+    def treinar_classificador_streaming(self, fonte_dados, mostrar_caracteristicas=True):
+        """
+        Treina o classificador a partir de qualquer iterável de (texto, sentimento),
+        como um arquivo, o corpus movie_reviews do NLTK ou um gerador.
+        
+        Os exemplos são consumidos uma única vez: apenas as tabelas de contagem
+        do Naive Bayes ficam em memória, sem lista de características.
+        """
+        print("Iniciando treinamento em streaming...")
+        
+        contagem = self._treinar_de_iteravel(fonte_dados)
+        
+        print(f"Treinamento concluído com {sum(contagem.values())} exemplos!")
+        for sentimento, quantidade in sorted(contagem.items()):
+            print(f"  - {sentimento}: {quantidade}")
+        if self.cache is not None:
+            print(f"  - Cache: {self.cache.acertos} reaproveitados, {self.cache.falhas} preprocessados")
+        
+        if mostrar_caracteristicas:
+            print("\nCaracterísticas mais informativas:")
+            self.classificador.show_most_informative_features(10)
+        
+        return contagem
+    
+    def _treinar_de_iteravel(self, fonte_dados):
+        """
+        Treina o Naive Bayes consumindo os exemplos sob demanda.
+        Retorna um Counter com o número de exemplos por sentimento.
+        """
+        iterador = iter(fonte_dados)
+        primeiro = next(iterador, None)
+        if primeiro is None:
+            raise ValueError("Nenhum dado de treinamento fornecido!")
+        
+        contagem = Counter()
+        if self.cache is not None:
+            self.cache.atualizar_versao(self.versao_pipeline())
+            self.cache.iniciar_execucao()
+        
+        def gerar_caracteristicas():
+            # O NaiveBayesClassifier.train percorre o iterável uma única vez,
+            # então cada conjunto de características é descartado após contado.
+            # A ordem não altera as contagens, por isso não há embaralhamento.
+            for frase, sentimento in chain([primeiro], iterador):
+                sentimento_norm = self._normalizar_sentimento(sentimento)
+                tokens = self._preprocessar_com_cache(frase)
+                contagem[sentimento_norm] += 1
+                yield self.extrair_caracteristicas(tokens), sentimento_norm
+        
+        self.classificador = NaiveBayesClassifier.train(gerar_caracteristicas())
+        self.exemplos_treinados = sum(contagem.values())
+        self._dados_do_modelo = None
+        
+        if self.cache is not None:
+            removidas = self.cache.podar()
+            if removidas:
+                print(f"🧹 Cache: {removidas} textos fora dos dados de treinamento removidos")
+        return contagem
+    
+    def relatorio_memoria(self, mostrar=True, top_n=10):
+        """
+        Mede quanta memória o modelo treinado ocupa e quais
+        características respondem pela maior parte dela.
+        """
+        if self.classificador is None:
+            raise ValueError("Classificador não foi treinado ainda!")
+        
+        relatorio = relatorio_memoria_modelo(
+            self.classificador, self.exemplos_treinados, top_n=top_n
+        )
+        
+        if mostrar:
+            print(f"\n🧮 MEMÓRIA DO MODELO: {formatar_bytes(relatorio['bytes_total'])}")
+            print("="*40)
+            for componente, num_bytes in relatorio['componentes'].items():
+                print(f"  - {componente}: {formatar_bytes(num_bytes)}")
+            print(f"Características: {relatorio['num_caracteristicas']}")
+            print(f"Valores distintos: {relatorio['num_valores_distintos']}")
+            print(f"Valores de num_palavras: {relatorio['valores_por_caracteristica'].get('num_palavras', 0)}")
+            if relatorio['bytes_por_exemplo'] is not None:
+                print(f"Média por exemplo treinado: {formatar_bytes(relatorio['bytes_por_exemplo'])}")
+            
+            print("\nCaracterísticas que mais ocupam memória:")
+            for item in relatorio['maiores_caracteristicas']:
+                print(f"  {item['caracteristica']:<30} {formatar_bytes(item['bytes']):>10} "
+                      f"({item['valores_distintos']} valores)")
+        
+        return relatorio
+    
+    def medir_crescimento_memoria(self, novos_exemplos, usar_dados_adicionais=True):
+        """
+        Estima quantos bytes o modelo cresce por exemplo adicionado,
+        treinando um modelo temporário com os dados atuais mais os novos.
+        O modelo em uso, os dados e o cache em disco não são alterados.
+        """
+        novos_exemplos = list(novos_exemplos)
+        if not novos_exemplos:
+            raise ValueError("Nenhum exemplo novo fornecido!")
+        
+        def dados_atuais():
+            if usar_dados_adicionais:
+                return chain(self.frases_treinamento, self.dados_adicionais)
+            return iter(self.frases_treinamento)
+        
+        # Se o modelo em uso já reflete os dados atuais, medir direto nele
+        modelo_em_dia = (
+            self.classificador is not None
+            and self._dados_do_modelo == (self._versao_dados, usar_dados_adicionais)
+        )
+        
+        modelo_atual = self.classificador
+        exemplos_atuais = self.exemplos_treinados
+        dados_do_modelo = self._dados_do_modelo
+        cache = self.cache
+        try:
+            # Os treinamentos temporários não devem gravar nem zerar o cache
+            self.cache = None
+            
+            if not modelo_em_dia:
+                self._treinar_de_iteravel(dados_atuais())
+            antes = relatorio_memoria_modelo(self.classificador)['bytes_total']
+            
+            self._treinar_de_iteravel(chain(dados_atuais(), novos_exemplos))
+            depois = relatorio_memoria_modelo(self.classificador)['bytes_total']
+        finally:
+            self.classificador = modelo_atual
+            self.exemplos_treinados = exemplos_atuais
+            self._dados_do_modelo = dados_do_modelo
+            self.cache = cache
+        
+        return {
+            'bytes_antes': antes,
+            'bytes_depois': depois,
+            'novos_exemplos': len(novos_exemplos),
+            'bytes_por_exemplo': (depois - antes) / len(novos_exemplos),
+        }
+    
+    def treinar_com_perfil_memoria(self, usar_dados_adicionais=True):
+        """
+        Treina o classificador rastreando o pico de alocação com tracemalloc,
+        útil para definir limites de memória de contêineres.
+        """
+        _, medicao = rastrear_pico_memoria(
+            self.treinar_classificador, usar_dados_adicionais=usar_dados_adicionais
+        )
+        
+        print(f"\n🧮 Pico de memória no treinamento: {formatar_bytes(medicao['bytes_pico'])}")
+        print(f"   Memória retida após o treinamento: {formatar_bytes(medicao['bytes_atual'])}")
+        print(f"   Tempo: {medicao['tempo']:.2f}s")
+        
+        return medicao
+    
+    def iterar_arquivo_treinamento(self, caminho, separador='\t'):
+        """
+        Lê um arquivo de treinamento linha a linha no formato
+        'frase<separador>sentimento', sem carregá-lo inteiro na memória.
+        """
+        with open(caminho, 'r', encoding='utf-8') as f:
+            for numero_linha, linha in enumerate(f, 1):
+                linha = linha.strip()
+                if not linha:
+                    continue
+                
+                frase, _, sentimento = linha.rpartition(separador)
+                if not frase:
+                    print(f"⚠️  Linha {numero_linha} ignorada: formato inválido")
+                    continue
+                
+                yield frase, sentimento
+    
+    def iterar_movie_reviews(self):
+        """
+        Percorre o corpus movie_reviews do NLTK lendo um arquivo por vez.
+        """
+        try:
+            nltk.data.find('corpora/movie_reviews')
+        except LookupError:
+            nltk.download('movie_reviews')
+        
+        from nltk.corpus import movie_reviews
+        
+        for categoria, sentimento in [('pos', 'positivo'), ('neg', 'negativo')]:
+            for fileid in movie_reviews.fileids(categoria):
+                yield movie_reviews.raw(fileid), sentimento
+    
     def modo_treinamento_interativo(self, tempo_entrada=30, tempo_treinamento=30):
         """
         Modo de treinamento interativo com tempo limitado.
@@ -375,7 +688,7 @@ class ClassificadorSentimentos:
             
             # Adicionar dados
             for frase, sentimento in dados:
-                self.dados_adicionais.append((frase, sentimento))
+                self._registrar_exemplo(frase, sentimento)
                 total_added += 1
             
             print(" ✅")
@@ -385,7 +698,7 @@ class ClassificadorSentimentos:
         dados_sinteticos = self._gerar_dados_sinteticos()
         
         for frase, sentimento in dados_sinteticos:
-            self.dados_adicionais.append((frase, sentimento))
+            self._registrar_exemplo(frase, sentimento)
             total_added += 1
         
         print("█" * 40 + f" ({len(dados_sinteticos)} exemplos) ✅")
@@ -458,9 +771,16 @@ class ClassificadorSentimentos:
         Salva os dados de treinamento em arquivo local.
         """
         try:
+            # Salvar em ordem de chegada, com a posição de cada exemplo,
+            # para que o peso de recência sobreviva a um recarregamento
+            itens = self._itens_por_chegada()
+            vistos, ultima_chegada = self._contagens_vistas()
             dados_para_salvar = {
                 'dados_originais': self.frases_treinamento,
-                'dados_adicionais': self.dados_adicionais,
+                'dados_adicionais': [exemplo for _, exemplo in itens],
+                'chegadas_adicionais': [chegada for chegada, _ in itens],
+                'vistos_adicionais': vistos,
+                'ultima_chegada': ultima_chegada,
                 'timestamp': datetime.now().isoformat()
             }
             
@@ -483,6 +803,16 @@ class ClassificadorSentimentos:
                     dados_carregados = json.load(f)
                 
                 self.dados_adicionais = dados_carregados.get('dados_adicionais', [])
+                self._versao_dados += 1
+                if self.reservatorio is not None:
+                    chegadas = dados_carregados.get('chegadas_adicionais')
+                    if not chegadas or len(chegadas) != len(self.dados_adicionais):
+                        chegadas = range(1, len(self.dados_adicionais) + 1)
+                    self._aplicar_orcamento(zip(chegadas, self.dados_adicionais))
+                    self.reservatorio.herdar_contagens(
+                        dados_carregados.get('vistos_adicionais', {}),
+                        dados_carregados.get('ultima_chegada', 0),
+                    )
                 timestamp = dados_carregados.get('timestamp', 'Desconhecido')
                 
                 print(f"📂 Dados carregados de arquivo local")
@@ -555,6 +885,185 @@ class ClassificadorSentimentos:
         
         return sentimento, confianca
     
+    def classificar_sentimento_rapido(self, texto):
+        """
+        Classifica como classificar_sentimento, mas interrompe a soma das
+        características assim que o resultado não pode mais mudar.
+        
+        Retorna (sentimento, confianca, erro): o sentimento é o mesmo do
+        classificador exato e a confiança exata está a no máximo 'erro' dela.
+        """
+        if self.classificador is None:
+            raise ValueError("Classificador não foi treinado ainda!")
+        
+        # Os limites dependem do modelo: recalcular após cada treinamento
+        if self._pontuador is None or self._pontuador.modelo is not self.classificador:
+            self._pontuador = PontuadorAntecipado(self.classificador)
+        
+        tokens = self.preprocessar_texto(texto)
+        resultado = self._pontuador.pontuar(self.extrair_caracteristicas(tokens))
+        
+        return resultado['sentimento'], resultado['confianca'], resultado['erro']
+    
+    def _iterar_sentencas(self, fonte, tamanho_bloco=10000):
+        """
+        Divide um texto em sentenças sob demanda com sent_tokenize.
+        'fonte' pode ser uma string ou qualquer iterável de pedaços de texto
+        (como um arquivo aberto); só um bloco de texto fica em memória.
+        """
+        if isinstance(fonte, str):
+            pedacos = (fonte[i:i + tamanho_bloco] for i in range(0, len(fonte), tamanho_bloco))
+        else:
+            pedacos = fonte
+        
+        resto = ''
+        for pedaco in pedacos:
+            resto += pedaco
+            if len(resto) < tamanho_bloco:
+                continue
+            
+            sentencas = sent_tokenize(resto)
+            if len(sentencas) > 1:
+                # A última sentença pode continuar no próximo pedaço
+                for sentenca in sentencas[:-1]:
+                    yield sentenca
+                resto = resto[resto.rfind(sentencas[-1]):]
+            elif len(resto) >= 2 * tamanho_bloco:
+                # Texto sem pontuação final: cortar no último espaço do bloco
+                corte = resto.rfind(' ', 0, tamanho_bloco)
+                if corte <= 0:
+                    corte = tamanho_bloco
+                yield resto[:corte]
+                resto = resto[corte:]
+        
+        if resto.strip():
+            yield from sent_tokenize(resto)
+    
+    def _iterar_chunks(self, fonte, max_caracteres_chunk):
+        """
+        Agrupa sentenças consecutivas em chunks de até 'max_caracteres_chunk'
+        caracteres. Com max_caracteres_chunk=None cada sentença é um chunk.
+        """
+        chunk = []
+        tamanho = 0
+        for sentenca in self._iterar_sentencas(fonte):
+            if chunk and (not max_caracteres_chunk or tamanho + len(sentenca) > max_caracteres_chunk):
+                yield ' '.join(chunk)
+                chunk = []
+                tamanho = 0
+            chunk.append(sentenca)
+            tamanho += len(sentenca) + 1
+        
+        if chunk:
+            yield ' '.join(chunk)
+    
+    def _classificar_lote(self, lote):
+        """
+        Classifica um lote de (índice, texto) de uma vez com prob_classify_many.
+        """
+        tokens_lote = [self.preprocessar_texto(texto) for _, texto in lote]
+        distribuicoes = self.classificador.prob_classify_many(
+            [self.extrair_caracteristicas(tokens) for tokens in tokens_lote]
+        )
+        
+        resultados = []
+        for (indice, texto), tokens, dist in zip(lote, tokens_lote, distribuicoes):
+            sentimento = dist.max()
+            resultados.append({
+                'indice': indice,
+                'texto': texto,
+                'sentimento': sentimento,
+                'confianca': dist.prob(sentimento),
+                'prob_positivo': dist.prob('positivo'),
+                'num_tokens': len(tokens),
+            })
+        return resultados
+    
+    def iterar_classificacao_documento(self, fonte, max_caracteres_chunk=500, tamanho_lote=64,
+                                       paralelo=False, max_workers=4):
+        """
+        Classifica um documento longo chunk a chunk, produzindo o resultado
+        de cada chunk na ordem do texto. 'fonte' pode ser uma string ou um
+        iterável de pedaços de texto, para documentos que não cabem na memória.
+        
+        Com paralelo=True os lotes são classificados em threads, mantendo no
+        máximo 2 * max_workers lotes em andamento.
+        """
+        if self.classificador is None:
+            raise ValueError("Classificador não foi treinado ainda!")
+        
+        def gerar_lotes():
+            lote = []
+            for indice, chunk in enumerate(self._iterar_chunks(fonte, max_caracteres_chunk)):
+                lote.append((indice, chunk))
+                if len(lote) >= tamanho_lote:
+                    yield lote
+                    lote = []
+            if lote:
+                yield lote
+        
+        if not paralelo:
+            for lote in gerar_lotes():
+                yield from self._classificar_lote(lote)
+            return
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pendentes = deque()
+            for lote in gerar_lotes():
+                pendentes.append(executor.submit(self._classificar_lote, lote))
+                if len(pendentes) >= 2 * max_workers:
+                    yield from pendentes.popleft().result()
+            while pendentes:
+                yield from pendentes.popleft().result()
+    
+    def classificar_documento(self, fonte, max_caracteres_chunk=500, tamanho_lote=64,
+                              paralelo=False, max_workers=4, incluir_chunks=True):
+        """
+        Classifica um documento longo por sentenças/chunks em vez de um único bloco.
+        
+        Retorna o sentimento agregado (média de P(positivo) ponderada pelo número
+        de tokens de cada chunk) e, se incluir_chunks=True, o resultado de cada chunk.
+        Para documentos muito grandes use incluir_chunks=False ou
+        iterar_classificacao_documento, que não acumulam os chunks.
+        """
+        chunks = [] if incluir_chunks else None
+        contagem = Counter()
+        soma_ponderada = 0.0
+        soma_pesos = 0
+        
+        for resultado in self.iterar_classificacao_documento(
+            fonte, max_caracteres_chunk, tamanho_lote, paralelo, max_workers
+        ):
+            peso = max(resultado['num_tokens'], 1)
+            soma_ponderada += resultado['prob_positivo'] * peso
+            soma_pesos += peso
+            contagem[resultado['sentimento']] += 1
+            if chunks is not None:
+                chunks.append(resultado)
+        
+        if not soma_pesos:
+            raise ValueError("Documento vazio!")
+        
+        pontuacao = soma_ponderada / soma_pesos
+        sentimento = 'positivo' if pontuacao >= 0.5 else 'negativo'
+        
+        return {
+            'sentimento': sentimento,
+            'confianca': pontuacao if sentimento == 'positivo' else 1 - pontuacao,
+            'pontuacao_positiva': pontuacao,
+            'num_chunks': sum(contagem.values()),
+            'chunks_por_sentimento': dict(contagem),
+            'chunks': chunks,
+        }
+    
+    def classificar_e_agregar(self, texto, agregador, fonte='padrao', timestamp=None):
+        """
+        Classifica um texto e registra o resultado em um AgregadorJanelas.
+        """
+        sentimento, confianca = self.classificar_sentimento(texto)
+        agregador.registrar(sentimento, confianca, fonte=fonte, timestamp=timestamp)
+        return sentimento, confianca
+    
     def avaliar_classificador(self):
         """
         Avalia o classificador usando validação cruzada simples.
@@ -598,7 +1107,7 @@ def main():
     print("="*60)
     
     # Criar e treinar o classificador
-    classificador = ClassificadorSentimentos()
+    classificador = ClassificadorSentimentos(caminho_cache='cache_caracteristicas.db')
     classificador.treinar_classificador()
     
     # Menu principal
@@ -679,6 +1188,14 @@ def main():
                     pos = sum(1 for _, s in classificador.dados_adicionais if s == 'positivo')
                     neg = len(classificador.dados_adicionais) - pos
                     print(f"Novos dados - Positivos: {pos}, Negativos: {neg}")
+                
+                if classificador.reservatorio is not None:
+                    print(f"Orçamento de treinamento: {classificador.reservatorio.orcamento}")
+                    for sentimento, contagem in classificador.reservatorio.contagens().items():
+                        print(f"  - {sentimento}: {contagem['mantidos']} mantidos de {contagem['vistos']} vistos")
+                
+                if classificador.classificador is not None:
+                    classificador.relatorio_memoria(top_n=5)
                     
             elif opcao == '7':
                 # Novo: Gerenciar Dados
@@ -686,9 +1203,10 @@ def main():
                 print("1. Salvar dados localmente")
                 print("2. Carregar dados salvos")
                 print("3. Limpar dados adicionais")
-                print("4. Voltar ao menu principal")
+                print("4. Definir orçamento de treinamento")
+                print("5. Voltar ao menu principal")
                 
-                sub_opcao = input("Escolha (1-4): ").strip()
+                sub_opcao = input("Escolha (1-5): ").strip()
                 
                 if sub_opcao == '1':
                     classificador.salvar_dados_localmente()
@@ -698,10 +1216,21 @@ def main():
                         classificador.treinar_classificador()
                 elif sub_opcao == '3':
                     if input("⚠️  Confirma limpeza dos dados? (s/N): ").lower() == 's':
-                        classificador.dados_adicionais.clear()
+                        classificador.limpar_dados_adicionais()
                         print("🗑️  Dados adicionais limpos!")
                         classificador.treinar_classificador()
                 elif sub_opcao == '4':
+                    try:
+                        orcamento = int(input("Máximo de exemplos adicionais (0 = sem limite): "))
+                        if orcamento <= 0:
+                            classificador.configurar_orcamento(None)
+                        else:
+                            recencia = input("Peso de recência (Enter = 0): ").strip()
+                            classificador.configurar_orcamento(orcamento, float(recencia or 0))
+                        classificador.treinar_classificador()
+                    except ValueError as e:
+                        print(f"❌ Valor inválido: {e}")
+                elif sub_opcao == '5':
                     continue
                 else:
                     print("❌ Opção inválida.")
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cache em disco dos textos já preprocessados, para que o retreinamento
+não precise repetir tokenização, remoção de stop words e stemming.
+"""
+
+import hashlib
+import json
+import sqlite3
+
+
+class CacheCaracteristicas:
+    """
+    Guarda os tokens preprocessados de cada texto em um banco SQLite,
+    indexados pelo hash do texto e pela versão do pipeline de
+    preprocessamento. Entradas de outras versões são descartadas
+    automaticamente ao abrir o cache ou ao trocar de versão.
+
+    Cada treinamento é uma execução numerada; entradas não usadas nas
+    últimas 'manter_execucoes' execuções são removidas por podar(), para
+    que textos que saíram dos dados de treinamento não fiquem no disco.
+    """
+
+    def __init__(self, caminho, versao_pipeline, intervalo_commit=500, manter_execucoes=3):
+        self.caminho = caminho
+        self.intervalo_commit = intervalo_commit
+        self.manter_execucoes = manter_execucoes
+        self.conexao = sqlite3.connect(caminho)
+
+        colunas = [linha[1] for linha in self.conexao.execute("PRAGMA table_info(tokens)")]
+        if colunas and 'execucao' not in colunas:
+            # Formato antigo, sem controle de uso: é só cache, recriar
+            self.conexao.execute("DROP TABLE tokens")
+        self.conexao.execute(
+            "CREATE TABLE IF NOT EXISTS tokens ("
+            "chave TEXT PRIMARY KEY, versao TEXT NOT NULL, tokens TEXT NOT NULL, "
+            "execucao INTEGER NOT NULL)"
+        )
+        self.execucao = self.conexao.execute(
+            "SELECT COALESCE(MAX(execucao), 0) FROM tokens"
+        ).fetchone()[0]
+        self.versao = None
+        self.atualizar_versao(versao_pipeline)
+        self.zerar_estatisticas()
+
+    @staticmethod
+    def chave(texto):
+        return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+    def atualizar_versao(self, versao_pipeline):
+        """
+        Passa a usar outra versão do pipeline, removendo as entradas antigas.
+        Retorna o número de entradas invalidadas.
+        """
+        if versao_pipeline == self.versao:
+            return 0
+
+        cursor = self.conexao.execute("DELETE FROM tokens WHERE versao != ?", (versao_pipeline,))
+        self.conexao.commit()
+        self.versao = versao_pipeline
+        self._pendentes = 0
+
+        if cursor.rowcount > 0:
+            print(f"♻️  Cache invalidado: {cursor.rowcount} entradas de outra versão do pipeline")
+        return cursor.rowcount
+
+    def iniciar_execucao(self):
+        """
+        Marca o início de um treinamento; as entradas usadas a partir daqui
+        contam como vistas nesta execução.
+        """
+        self.execucao += 1
+        self.zerar_estatisticas()
+
+    def obter(self, texto):
+        """
+        Retorna os tokens guardados para o texto, ou None se não estiverem no cache.
+        """
+        chave = self.chave(texto)
+        linha = self.conexao.execute(
+            "SELECT tokens, execucao FROM tokens WHERE chave = ? AND versao = ?",
+            (chave, self.versao),
+        ).fetchone()
+        if not linha:
+            return None
+
+        if linha[1] != self.execucao:
+            self.conexao.execute(
+                "UPDATE tokens SET execucao = ? WHERE chave = ?", (self.execucao, chave)
+            )
+            self._registrar_escrita()
+        return json.loads(linha[0])
+
+    def guardar(self, texto, tokens):
+        self.conexao.execute(
+            "INSERT OR REPLACE INTO tokens (chave, versao, tokens, execucao) VALUES (?, ?, ?, ?)",
+            (self.chave(texto), self.versao, json.dumps(tokens, ensure_ascii=False), self.execucao),
+        )
+        self._registrar_escrita()
+
+    def _registrar_escrita(self):
+        self._pendentes += 1
+        if self._pendentes >= self.intervalo_commit:
+            self.salvar()
+
+    def podar(self):
+        """
+        Remove as entradas não usadas nas últimas 'manter_execucoes' execuções.
+        Retorna o número de entradas removidas.
+        """
+        cursor = self.conexao.execute(
+            "DELETE FROM tokens WHERE execucao <= ?", (self.execucao - self.manter_execucoes,)
+        )
+        self.salvar()
+        return cursor.rowcount
+
+    def obter_ou_calcular(self, texto, preprocessar):
+        """
+        Retorna os tokens do cache ou os calcula com 'preprocessar' e os guarda.
+        """
+        tokens = self.obter(texto)
+        if tokens is not None:
+            self.acertos += 1
+            return tokens
+
+        self.falhas += 1
+        tokens = preprocessar(texto)
+        self.guardar(texto, tokens)
+        return tokens
+
+    def salvar(self):
+        self.conexao.commit()
+        self._pendentes = 0
+
+    def zerar_estatisticas(self):
+        self.acertos = 0
+        self.falhas = 0
+
+    def __len__(self):
+        return self.conexao.execute(
+            "SELECT COUNT(*) FROM tokens WHERE versao = ?", (self.versao,)
+        ).fetchone()[0]
+
+    def fechar(self):
+        self.salvar()
+        self.conexao.close()
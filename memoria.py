@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ferramentas para medir a memória usada pelo classificador Naive Bayes
+e os picos de alocação durante o treinamento.
+"""
+
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+
+
+def tamanho_profundo(obj, vistos=None):
+    """
+    Soma o sys.getsizeof de um objeto e de tudo que ele referencia
+    (dicionários, sequências, conjuntos e atributos de instâncias).
+    Objetos já presentes em 'vistos' não são contados novamente.
+    """
+    if vistos is None:
+        vistos = set()
+
+    total = 0
+    pendentes = [obj]
+
+    while pendentes:
+        atual = pendentes.pop()
+        if id(atual) in vistos:
+            continue
+        vistos.add(id(atual))
+        total += sys.getsizeof(atual)
+
+        if isinstance(atual, dict):
+            pendentes.extend(atual.keys())
+            pendentes.extend(atual.values())
+        elif isinstance(atual, (list, tuple, set, frozenset)):
+            pendentes.extend(atual)
+
+        if hasattr(atual, '__dict__'):
+            pendentes.append(atual.__dict__)
+
+    return total
+
+
+def relatorio_memoria_modelo(modelo, exemplos_treinados=None, top_n=10):
+    """
+    Calcula o uso de memória de um NaiveBayesClassifier treinado.
+
+    Retorna um dicionário com os bytes por componente (distribuição de
+    rótulos, tabelas de valores das características e strings do
+    vocabulário), contagens de características e valores distintos e
+    as características que mais ocupam memória.
+    """
+    vistos = set()
+    tabelas = modelo._feature_probdist
+
+    # Strings do vocabulário primeiro, para não contá-las nas tabelas
+    nomes = {fname for _, fname in tabelas}
+    bytes_vocabulario = sum(tamanho_profundo(fname, vistos) for fname in nomes)
+
+    bytes_rotulos = tamanho_profundo(modelo._label_probdist, vistos)
+    bytes_rotulos += tamanho_profundo(modelo._labels, vistos)
+
+    # Tabelas de valores: contêiner, chaves (rótulo, nome) e distribuições
+    bytes_por_caracteristica = defaultdict(int)
+    valores_por_caracteristica = defaultdict(set)
+    bytes_tabelas = sys.getsizeof(tabelas)
+    vistos.add(id(tabelas))
+
+    for chave, probdist in tabelas.items():
+        _, fname = chave
+        tamanho = tamanho_profundo(chave, vistos) + tamanho_profundo(probdist, vistos)
+        bytes_por_caracteristica[fname] += tamanho
+        bytes_tabelas += tamanho
+        valores_por_caracteristica[fname].update(probdist.samples())
+
+    total_valores = sum(len(v) for v in valores_por_caracteristica.values())
+    maiores = sorted(bytes_por_caracteristica.items(), key=lambda item: item[1], reverse=True)
+    bytes_total = bytes_vocabulario + bytes_rotulos + bytes_tabelas
+
+    relatorio = {
+        'bytes_total': bytes_total,
+        'componentes': {
+            'distribuicao_rotulos': bytes_rotulos,
+            'tabelas_caracteristicas': bytes_tabelas,
+            'vocabulario': bytes_vocabulario,
+        },
+        'num_rotulos': len(modelo._labels),
+        'num_caracteristicas': len(nomes),
+        'num_valores_distintos': total_valores,
+        'valores_por_caracteristica': {
+            fname: len(valores) for fname, valores in valores_por_caracteristica.items()
+        },
+        'maiores_caracteristicas': [
+            {
+                'caracteristica': fname,
+                'bytes': tamanho,
+                'valores_distintos': len(valores_por_caracteristica[fname]),
+            }
+            for fname, tamanho in maiores[:top_n]
+        ],
+        'exemplos_treinados': exemplos_treinados,
+        'bytes_por_exemplo': None,
+    }
+
+    if exemplos_treinados:
+        relatorio['bytes_por_exemplo'] = bytes_total / exemplos_treinados
+
+    return relatorio
+
+
+def rastrear_pico_memoria(funcao, *args, **kwargs):
+    """
+    Executa a função com o tracemalloc ativo e retorna o resultado
+    junto com a memória atual e o pico de alocação (em bytes).
+    """
+    ja_rastreando = tracemalloc.is_tracing()
+    if ja_rastreando:
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+    else:
+        tracemalloc.start()
+        base = 0
+
+    inicio = time.time()
+    try:
+        resultado = funcao(*args, **kwargs)
+        atual, pico = tracemalloc.get_traced_memory()
+    finally:
+        if not ja_rastreando:
+            tracemalloc.stop()
+
+    medicao = {
+        'bytes_atual': atual - base,
+        'bytes_pico': pico - base,
+        'tempo': time.time() - inicio,
+    }
+    return resultado, medicao
+
+
+def formatar_bytes(num_bytes):
+    """
+    Formata uma quantidade de bytes em uma unidade legível.
+    """
+    for unidade in ['B', 'KB', 'MB', 'GB']:
+        if abs(num_bytes) < 1024 or unidade == 'GB':
+            break
+        num_bytes /= 1024
+    return f"{num_bytes:.1f} {unidade}"
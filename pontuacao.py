@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pontuação com saída antecipada para o NaiveBayesClassifier do NLTK.
+"""
+
+import math
+from itertools import chain, combinations
+
+# Folga para erros de arredondamento ao comparar margens
+EPSILON = 1e-9
+
+
+class PontuadorAntecipado:
+    """
+    Classifica como o prob_classify do NLTK, mas para de somar
+    características quando a margem atual não pode mais ser revertida.
+
+    Para cada característica e cada par de rótulos é pré-calculada a maior
+    variação possível de log-verossimilhança entre os dois rótulos, sobre
+    todos os valores que ela pode assumir (inclusive valores nunca vistos).
+    As características do texto são somadas da mais para a menos
+    informativa; quando a vantagem do rótulo líder sobre cada outro rótulo
+    supera a soma das variações máximas restantes, o rótulo está decidido.
+    """
+
+    def __init__(self, modelo):
+        self.modelo = modelo
+        self._rotulos = list(modelo.labels())
+        num_rotulos = len(self._rotulos)
+        self._pares = list(combinations(range(num_rotulos), 2))
+        self._indice_par = {}
+        for indice, (a, b) in enumerate(self._pares):
+            self._indice_par[a, b] = self._indice_par[b, a] = indice
+        self._logprob_rotulos = [
+            modelo._label_probdist.logprob(rotulo) for rotulo in self._rotulos
+        ]
+
+        distribuicoes = {}
+        for (rotulo, fname), probdist in modelo._feature_probdist.items():
+            distribuicoes.setdefault(fname, {})[rotulo] = probdist
+
+        # Por característica: log P(valor|rótulo) de cada valor visto, o
+        # mesmo para um valor nunca visto, e a variação máxima por par
+        self._tabelas = {}
+        self._limites = {}
+        self._limite_max = {}
+        valor_nao_visto = object()
+
+        for fname, por_rotulo in distribuicoes.items():
+            def logprobs(valor):
+                return tuple(
+                    por_rotulo[rotulo].logprob(valor) if rotulo in por_rotulo else -math.inf
+                    for rotulo in self._rotulos
+                )
+
+            valores = set()
+            for probdist in por_rotulo.values():
+                valores.update(probdist.samples())
+            tabela = {valor: logprobs(valor) for valor in valores}
+            nao_visto = logprobs(valor_nao_visto)
+
+            limites = []
+            for a, b in self._pares:
+                if math.isinf(nao_visto[a]) or math.isinf(nao_visto[b]):
+                    # O NLTK soma -inf nesse caso: nenhuma margem é segura
+                    limites.append(math.inf)
+                    continue
+                limites.append(max(
+                    abs(lps[a] - lps[b]) for lps in chain(tabela.values(), [nao_visto])
+                ))
+
+            self._tabelas[fname] = (tabela, nao_visto)
+            self._limites[fname] = limites
+            self._limite_max[fname] = max(limites, default=0.0)
+
+        # Limites infinitos impedem a subtração incremental da folga restante
+        self._limites_finitos = all(
+            not math.isinf(limite) for limite in self._limite_max.values()
+        )
+
+    def _intervalo_confianca(self, logprob, lider, restantes):
+        """
+        Limites inferior e superior de P(lider) dadas as variações que
+        as características não avaliadas ainda poderiam causar.
+        """
+        soma_min = 1.0
+        soma_max = 1.0
+        for rotulo in range(len(self._rotulos)):
+            if rotulo == lider:
+                continue
+            diferenca = logprob[rotulo] - logprob[lider]
+            folga = restantes[self._indice_par[lider, rotulo]]
+            soma_min += 2.0 ** (diferenca + folga)
+            soma_max += 2.0 ** (diferenca - folga)
+        return 1.0 / soma_min, 1.0 / soma_max
+
+    def pontuar(self, featureset):
+        """
+        Retorna um dicionário com o rótulo, a confiança estimada, o erro
+        máximo dessa confiança e quantas características foram avaliadas.
+        """
+        # Como no NLTK, características nunca vistas são ignoradas
+        limite_max = self._limite_max
+        caracteristicas = [
+            (fname, fval) for fname, fval in featureset.items() if fname in limite_max
+        ]
+        caracteristicas.sort(key=lambda item: limite_max[item[0]], reverse=True)
+
+        if len(self._rotulos) == 2 and self._limites_finitos:
+            return self._pontuar_binario(featureset, caracteristicas)
+
+        # Soma das variações máximas a partir de cada posição, por par de rótulos
+        sufixos = [[0.0] * len(self._pares)]
+        for fname, _ in reversed(caracteristicas):
+            sufixos.append([r + l for r, l in zip(sufixos[-1], self._limites[fname])])
+        sufixos.reverse()
+
+        rotulos = range(len(self._rotulos))
+        logprob = list(self._logprob_rotulos)
+        total = len(caracteristicas)
+
+        for posicao in range(total + 1):
+            restantes = sufixos[posicao]
+            lider = max(rotulos, key=logprob.__getitem__)
+            decidido = all(
+                logprob[lider] - logprob[rotulo] > restantes[self._indice_par[lider, rotulo]] + EPSILON
+                for rotulo in rotulos if rotulo != lider
+            )
+            if decidido:
+                minimo, maximo = self._intervalo_confianca(logprob, lider, restantes)
+                return {
+                    'sentimento': self._rotulos[lider],
+                    'confianca': (minimo + maximo) / 2,
+                    'erro': (maximo - minimo) / 2,
+                    'avaliadas': posicao,
+                    'total': total,
+                }
+
+            if posicao < total:
+                fname, fval = caracteristicas[posicao]
+                tabela, nao_visto = self._tabelas[fname]
+                for rotulo, lp in enumerate(tabela.get(fval, nao_visto)):
+                    logprob[rotulo] += lp
+
+        return self._pontuar_exato(featureset, total)
+
+    def _pontuar_binario(self, featureset, caracteristicas):
+        """
+        Caso de dois rótulos: basta acompanhar a margem entre eles e a
+        soma das variações máximas ainda não avaliadas.
+        """
+        limite_max = self._limite_max
+        tabelas = self._tabelas
+        margem = self._logprob_rotulos[0] - self._logprob_rotulos[1]
+        restante = sum(limite_max[fname] for fname, _ in caracteristicas)
+        # Folga para o arredondamento acumulado nas subtrações de 'restante'
+        folga = EPSILON * (1 + restante)
+
+        for posicao, (fname, fval) in enumerate(caracteristicas):
+            if abs(margem) > restante + folga:
+                return self._resultado_binario(margem, restante, posicao, len(caracteristicas))
+            tabela, nao_visto = tabelas[fname]
+            lp_a, lp_b = tabela.get(fval, nao_visto)
+            margem += lp_a - lp_b
+            restante -= limite_max[fname]
+
+        if abs(margem) > folga:
+            return self._resultado_binario(margem, 0.0, len(caracteristicas), len(caracteristicas))
+        return self._pontuar_exato(featureset, len(caracteristicas))
+
+    def _resultado_binario(self, margem, restante, avaliadas, total):
+        restante = max(restante, 0.0)
+        minimo = 1.0 / (1.0 + 2.0 ** (restante - abs(margem)))
+        maximo = 1.0 / (1.0 + 2.0 ** (-restante - abs(margem)))
+        return {
+            'sentimento': self._rotulos[0 if margem > 0 else 1],
+            'confianca': (minimo + maximo) / 2,
+            'erro': (maximo - minimo) / 2,
+            'avaliadas': avaliadas,
+            'total': total,
+        }
+
+    def _pontuar_exato(self, featureset, total):
+        # Empate (dentro do arredondamento): usar o pontuador exato do NLTK
+        distribuicao = self.modelo.prob_classify(featureset)
+        sentimento = distribuicao.max()
+        return {
+            'sentimento': sentimento,
+            'confianca': distribuicao.prob(sentimento),
+            'erro': 0.0,
+            'avaliadas': total,
+            'total': total,
+        }